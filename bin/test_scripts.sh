@@ -26,4 +26,7 @@ CMD='covascens --interv_day=35 --interv_eff=0.7'
 echo "running ${CMD}"; eval $CMD
 
 CMD='covascens --do_save=True'
-echo "running ${CMD}"; eval $CMD
\ No newline at end of file
+echo "running ${CMD}"; eval $CMD
+
+CMD='covasim-warmup'
+echo "running ${CMD}"; eval $CMD
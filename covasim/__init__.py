@@ -29,4 +29,6 @@ from .analysis      import * # Depends on utils, misc, interventions
 from .sim           import * # Depends on almost everything
 from .run           import * # Depends on sim
 
-
+# Optionally populate the Numba cache for all precisions, via e.g. os.environ['COVASIM_WARMUP'] = '1'
+from . import warmup
+warmup.check_warmup()
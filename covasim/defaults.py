@@ -18,18 +18,33 @@ __all__ = ['default_float', 'default_int', 'get_default_colors', 'get_default_pl
 #%% Specify what data types to use
 
 result_float = np.float64 # Always use float64 for results, for simplicity
-if cvo.precision == 32:
-    default_float = np.float32
-    default_int   = np.int32
-    nbfloat       = nb.float32
-    nbint         = nb.int32
-elif cvo.precision == 64: # pragma: no cover
-    default_float = np.float64
-    default_int   = np.int64
-    nbfloat       = nb.float64
-    nbint         = nb.int64
-else:
-    raise NotImplementedError(f'Precision must be either 32 bit or 64 bit, not {cvo.precision}')
+
+def set_precision(precision):
+    '''
+    Set the data types used by Covasim and its Numba functions -- not for the user,
+    use ``cv.options.set(precision=64)`` instead. Since the Numba signatures are
+    built from these types, ``cv.utils`` must be reloaded for changes to take effect.
+
+    Args:
+        precision (int): the arithmetic precision, either 32 or 64 bit
+    '''
+    global default_float, default_int, nbfloat, nbint
+    if precision == 32:
+        default_float = np.float32
+        default_int   = np.int32
+        nbfloat       = nb.float32
+        nbint         = nb.int32
+    elif precision == 64: # pragma: no cover
+        default_float = np.float64
+        default_int   = np.int64
+        nbfloat       = nb.float64
+        nbint         = nb.int64
+    else:
+        raise NotImplementedError(f'Precision must be either 32 bit or 64 bit, not {precision}')
+    return
+
+set_precision(cvo.precision)
+nbcache = cvo.numba_cache # Whether Numba functions are cached to disk; read by every Numba decorator
 
 
 #%% Define all properties of people
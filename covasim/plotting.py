@@ -82,10 +82,9 @@ def handle_args(fig_args=None, plot_args=None, scatter_args=None, axis_args=None
 
 def handle_show(do_show):
     ''' Helper function to handle the slightly complex logic of show -- not for users '''
-    backend = pl.get_backend()
     if do_show is None:  # If not supplied, reset to global value
         do_show = cvo.show
-    if backend == 'agg': # Cannot show plots for a non-interactive backend
+    if do_show and pl.get_backend() == 'agg': # Cannot show plots for a non-interactive backend; only check the backend if needed
         do_show = False
     if do_show: # Now check whether to show, and atually do it
         pl.show()
@@ -23,6 +23,20 @@ __all__ = ['options']
 
 #%% General settings
 
+# Options that require the Numba functions to be rebuilt when changed
+numba_keys = frozenset(['precision', 'numba_parallel', 'numba_cache'])
+
+# Deprecated option names, and what they have been renamed to
+renamed_keys = {'font_size': 'fontsize', 'font_family':'font'}
+
+
+def getenv(name, default=None):
+    ''' Get an environment variable, only evaluating the default if it's callable and the variable isn't set '''
+    value = os.getenv(name) if name else None
+    if value is None:
+        value = default() if callable(default) else default
+    return value
+
 
 # Define simple plotting options -- similar to Matplotlib default
 rc_simple = {
@@ -42,6 +56,29 @@ rc_covasim = sc.mergedicts(rc_simple, {
     'grid.linewidth': 1,
 })
 
+# Define the options: key, environment variable, default value, type conversion, and description.
+# Defaults that are functions are only evaluated if the environment variable isn't set.
+option_specs = [
+    ('verbose',        'COVASIM_VERBOSE',        0.1,                                  float, 'Set default level of verbosity (i.e. logging detail): e.g., 0.1 is an update every 10 simulated days'),
+    ('style',          'COVASIM_STYLE',          'covasim',                            None,  'Set the default plotting style -- options are "covasim" and "simple" plus those in pl.style.available; see also options.rc'),
+    ('dpi',            'COVASIM_DPI',            lambda: pl.rcParams['figure.dpi'],    int,   'Set the default DPI -- the larger this is, the larger the figures will be'),
+    ('font',           'COVASIM_FONT',           lambda: pl.rcParams['font.family'],   None,  'Set the default font family (e.g., sans-serif or Arial)'),
+    ('fontsize',       'COVASIM_FONT_SIZE',      lambda: pl.rcParams['font.size'],     int,   'Set the default font size'),
+    ('interactive',    'COVASIM_INTERACTIVE',    True,                                 None,  'Convenience method to set figure backend, showing, and closing behavior'),
+    ('jupyter',        'COVASIM_JUPYTER',        False,                                None,  'Convenience method to set common settings for Jupyter notebooks: set to "retina" or "widget" (default) to set backend'),
+    ('show',           'COVASIM_SHOW',           True,                                 int,   'Set whether or not to show figures (i.e. call pl.show() automatically)'),
+    ('close',          'COVASIM_CLOSE',          False,                                int,   'Set whether or not to close figures (i.e. call pl.close() automatically)'),
+    ('returnfig',      'COVASIM_RETURNFIG',      True,                                 int,   'Set whether or not to return figures from plotting functions'),
+    ('backend',        'COVASIM_BACKEND',        pl.get_backend,                       None,  'Set the Matplotlib backend (use "agg" for non-interactive)'), # Resolving the backend can be slow, so skip if not needed
+    ('rc',             None,                     rc_covasim.copy,                      None,  'Matplotlib rc (run control) style parameters used during plotting -- usually set automatically by "style" option'), # The rc dicts are flat, so a shallow copy is sufficient
+    ('warnings',       'COVASIM_WARNINGS',       'warn',                               str,   'How warnings are handled: options are "warn" (default), "print", and "error"'),
+    ('sep',            'COVASIM_SEP',            ',',                                  str,   'Set thousands seperator for text output'),
+    ('precision',      'COVASIM_PRECISION',      32,                                   int,   'Set arithmetic precision for Numba -- 32-bit by default for efficiency'),
+    ('numba_parallel', 'COVASIM_NUMBA_PARALLEL', 'none',                               str,   'Set Numba multithreading -- none, safe, full; full multithreading is ~20% faster, but results become nondeterministic'),
+    ('numba_cache',    'COVASIM_NUMBA_CACHE',    1,                                    lambda x: bool(int(x)), 'Set Numba caching -- saves on compilation time; disabling is not recommended'),
+    ('warmup',         'COVASIM_WARMUP',         0,                                    lambda x: bool(int(x)), 'Populate the Numba cache for all precisions the first time Covasim is imported (see covasim.warmup); only has an effect on import'),
+]
+
 
 #%% Define the options class
 
@@ -89,7 +126,12 @@ class Options(sc.objdict):
         optdesc, options = self.get_orig_options() # Get the options
         self.update(options) # Update this object with them
         self.setattribute('optdesc', optdesc) # Set the description as an attribute, not a dict entry
-        self.setattribute('orig_options', sc.dcp(options)) # Copy the default options
+        orig_options = sc.objdict({k:(v.copy() if isinstance(v, (dict, list)) else v) for k,v in options.items()}) # Copy the default options; only containers need copying, and they're flat
+        self.setattribute('orig_options', orig_options)
+        self.setattribute('_valid_keys', frozenset(options.keys())) # For checking keys in set()
+        self.setattribute('_fonts_loaded', False) # Fonts are only loaded when first needed for plotting
+        self.setattribute('_help_template', None) # Populated the first time help() is called
+        self.setattribute('_jupyter_configured', None) # The Jupyter mode that has been set up, if any
         return
 
 
@@ -100,7 +142,7 @@ class Options(sc.objdict):
 
     def to_dict(self):
         ''' Pull out only the settings from the options object '''
-        return {k:v for k,v in self.items()}
+        return dict(self)
 
 
     def __repr__(self):
@@ -155,56 +197,10 @@ class Options(sc.objdict):
         optdesc = sc.objdict() # Help for the options
         options = sc.objdict() # The options
 
-        optdesc.verbose = 'Set default level of verbosity (i.e. logging detail): e.g., 0.1 is an update every 10 simulated days'
-        options.verbose = float(os.getenv('COVASIM_VERBOSE', 0.1))
-
-        optdesc.style = 'Set the default plotting style -- options are "covasim" and "simple" plus those in pl.style.available; see also options.rc'
-        options.style = os.getenv('COVASIM_STYLE', 'covasim')
-
-        optdesc.dpi = 'Set the default DPI -- the larger this is, the larger the figures will be'
-        options.dpi = int(os.getenv('COVASIM_DPI', pl.rcParams['figure.dpi']))
-
-        optdesc.font = 'Set the default font family (e.g., sans-serif or Arial)'
-        options.font = os.getenv('COVASIM_FONT', pl.rcParams['font.family'])
-
-        optdesc.fontsize = 'Set the default font size'
-        options.fontsize = int(os.getenv('COVASIM_FONT_SIZE', pl.rcParams['font.size']))
-
-        optdesc.interactive = 'Convenience method to set figure backend, showing, and closing behavior'
-        options.interactive = os.getenv('COVASIM_INTERACTIVE', True)
-
-        optdesc.jupyter = 'Convenience method to set common settings for Jupyter notebooks: set to "retina" or "widget" (default) to set backend'
-        options.jupyter = os.getenv('COVASIM_JUPYTER', False)
-
-        optdesc.show = 'Set whether or not to show figures (i.e. call pl.show() automatically)'
-        options.show = int(os.getenv('COVASIM_SHOW', True))
-
-        optdesc.close = 'Set whether or not to close figures (i.e. call pl.close() automatically)'
-        options.close = int(os.getenv('COVASIM_CLOSE', False))
-
-        optdesc.returnfig = 'Set whether or not to return figures from plotting functions'
-        options.returnfig = int(os.getenv('COVASIM_RETURNFIG', True))
-
-        optdesc.backend = 'Set the Matplotlib backend (use "agg" for non-interactive)'
-        options.backend = os.getenv('COVASIM_BACKEND', pl.get_backend())
-
-        optdesc.rc = 'Matplotlib rc (run control) style parameters used during plotting -- usually set automatically by "style" option'
-        options.rc = sc.dcp(rc_covasim)
-
-        optdesc.warnings = 'How warnings are handled: options are "warn" (default), "print", and "error"'
-        options.warnings = str(os.getenv('COVASIM_WARNINGS', 'warn'))
-
-        optdesc.sep = 'Set thousands seperator for text output'
-        options.sep = str(os.getenv('COVASIM_SEP', ','))
-
-        optdesc.precision = 'Set arithmetic precision for Numba -- 32-bit by default for efficiency'
-        options.precision = int(os.getenv('COVASIM_PRECISION', 32))
-
-        optdesc.numba_parallel = 'Set Numba multithreading -- none, safe, full; full multithreading is ~20% faster, but results become nondeterministic'
-        options.numba_parallel = str(os.getenv('COVASIM_NUMBA_PARALLEL', 'none'))
-
-        optdesc.numba_cache = 'Set Numba caching -- saves on compilation time; disabling is not recommended'
-        options.numba_cache = bool(int(os.getenv('COVASIM_NUMBA_CACHE', 1)))
+        for key, variable, default, convert, desc in option_specs:
+            value = getenv(variable, default)
+            optdesc[key] = desc
+            options[key] = convert(value) if convert else value
 
         return optdesc, options
 
@@ -227,7 +223,7 @@ class Options(sc.objdict):
 
         # Reset to defaults
         if key in ['default', 'defaults']:
-            kwargs = self.orig_options # Reset everything to default
+            kwargs = dict(self.orig_options) # Reset everything to default; copy since modified below
 
         # Handle other keys
         elif key is not None:
@@ -237,19 +233,21 @@ class Options(sc.objdict):
         if 'jupyter' in kwargs.keys() and kwargs['jupyter']:
             jupyter = kwargs['jupyter']
             kwargs['returnfig'] = False # We almost never want to return figs from Jupyter, since then they appear twice
-            try: # This makes plots much nicer, but isn't available on all systems
-                if not os.environ.get('SPHINX_BUILD'): # Custom check implemented in conf.py to skip this if we're inside Sphinx
-                    try: # First try interactive
-                        assert jupyter not in ['default', 'retina'] # Hack to intentionally go to the other part of the loop
-                        from IPython import get_ipython
-                        magic = get_ipython().magic
-                        magic('%matplotlib widget')
-                    except: # Then try retina
-                        assert jupyter != 'default'
-                        import matplotlib_inline
-                        matplotlib_inline.backend_inline.set_matplotlib_formats('retina')
-            except:
-                pass
+            if jupyter != self._jupyter_configured: # Only configure once per mode, since importing and setting up the backend is slow
+                try: # This makes plots much nicer, but isn't available on all systems
+                    if not os.environ.get('SPHINX_BUILD'): # Custom check implemented in conf.py to skip this if we're inside Sphinx
+                        try: # First try interactive
+                            assert jupyter not in ['default', 'retina'] # Hack to intentionally go to the other part of the loop
+                            from IPython import get_ipython
+                            magic = get_ipython().magic
+                            magic('%matplotlib widget')
+                        except: # Then try retina
+                            assert jupyter != 'default'
+                            import matplotlib_inline
+                            matplotlib_inline.backend_inline.set_matplotlib_formats('retina')
+                        self.setattribute('_jupyter_configured', jupyter) # Only record the mode once it's been set up successfully
+                except:
+                    pass
 
         # Handle interactivity
         if 'interactive' in kwargs.keys():
@@ -268,15 +266,14 @@ class Options(sc.objdict):
         for key,value in kwargs.items():
 
             # Handle deprecations
-            rename = {'font_size': 'fontsize', 'font_family':'font'}
-            if key in rename.keys():
+            if key in renamed_keys:
                 from . import misc as cvm # Here to avoid circular import
                 oldkey = key
-                key = rename[oldkey]
+                key = renamed_keys[oldkey]
                 warnmsg = f'Key "{oldkey}" is deprecated, please use "{key}" instead'
                 cvm.warn(warnmsg, FutureWarning)
 
-            if key not in self:
+            if key not in self._valid_keys:
                 keylist = self.orig_options.keys()
                 keys = '\n'.join(keylist)
                 errormsg = f'Option "{key}" not recognized; options are "defaults" or:\n{keys}\n\nSee help(cv.options.set) for more information.'
@@ -284,11 +281,12 @@ class Options(sc.objdict):
             else:
                 if value in [None, 'default']:
                     value = self.orig_options[key]
+                if key == 'rc':
+                    value = dict(value) # Copy so that later changes to the current settings don't modify the defaults
                 self[key] = value
-                numba_keys = ['precision', 'numba_parallel', 'numba_cache'] # Specify which keys require a reload
                 if key in numba_keys:
                     reload_required = True
-                if key in 'backend':
+                if key == 'backend' and str(value).lower() != pl.get_backend().lower(): # Switching is slow, so only do it if needed
                     pl.switch_backend(value)
 
         if reload_required:
@@ -362,30 +360,37 @@ class Options(sc.objdict):
             print(self.__doc__)
             return
 
+        # The defaults, environment variables, and descriptions don't change, so only format them once
         n = 15 # Size of indent
+        if self._help_template is None:
+            variables = {spec[0]:spec[1] for spec in option_specs}
+            template = sc.objdict()
+            for key in self.orig_options.keys():
+                entry = sc.objdict()
+                entry.default = sc.indent(n=n, width=None, text=sc.pp(self.orig_options[key], output=True)).rstrip()
+                entry.variable = variables.get(key) or 'No environment variable'
+                entry.desc = sc.indent(n=n, text=self.optdesc[key])
+                template[key] = entry
+            self.setattribute('_help_template', template)
+
+        # Add the current settings
         optdict = sc.objdict()
-        for key in self.orig_options.keys():
-            entry = sc.objdict()
-            entry.key = key
-            entry.current = sc.indent(n=n, width=None, text=sc.pp(self[key], output=True)).rstrip()
-            entry.default = sc.indent(n=n, width=None, text=sc.pp(self.orig_options[key], output=True)).rstrip()
-            if not key.startswith('rc'):
-                entry.variable = f'COVASIM_{key.upper()}' # NB, hard-coded above!
-            else:
-                entry.variable = 'No environment variable'
-            entry.desc = sc.indent(n=n, text=self.optdesc[key])
-            optdict[key] = entry
+        for key,entry in self._help_template.items():
+            current = sc.indent(n=n, width=None, text=sc.pp(self[key], output=True)).rstrip()
+            optdict[key] = sc.objdict(key=key, current=current, **entry)
 
         # Convert to a dataframe for nice printing
         print('Covasim global options ("Environment" = name of corresponding environment variable):')
         for k, key, entry in optdict.enumitems():
             sc.heading(f'{k}. {key}', spaces=0, spacesafter=0)
             changestr = '' if entry.current == entry.default else ' (modified)'
-            print(f'          Key: {key}')
-            print(f'      Current: {entry.current}{changestr}')
-            print(f'      Default: {entry.default}')
-            print(f'  Environment: {entry.variable}')
-            print(f'  Description: {entry.desc}')
+            print('\n'.join([
+                f'          Key: {key}',
+                f'      Current: {entry.current}{changestr}',
+                f'      Default: {entry.default}',
+                f'  Environment: {entry.variable}',
+                f'  Description: {entry.desc}',
+            ]))
 
         sc.heading('Methods:', spacesafter=0)
         print('''
@@ -435,26 +440,40 @@ class Options(sc.objdict):
         return output
 
 
+    def _load_fonts(self):
+        ''' Helper function to load the custom fonts the first time a style is used, rather than on import '''
+        if not self._fonts_loaded:
+            orig_font = rc_covasim['font.family']
+            load_fonts()
+            font = rc_covasim['font.family']
+            for rc in [self.rc, self.orig_options['rc']]: # Update the copies made on initialization, unless the font has been changed
+                if rc.get('font.family') == orig_font:
+                    rc['font.family'] = font
+            self.setattribute('_fonts_loaded', True)
+            self.setattribute('_help_template', None) # The default rc has changed, so regenerate the help
+        return
+
+
     def _handle_style(self, style=None, reset=False, copy=True):
         ''' Helper function to handle logic for different styles '''
         rc = self.rc # By default, use current
         if isinstance(style, dict): # If an rc-like object is supplied directly
-            rc = sc.dcp(style)
+            rc = dict(style)
         elif style is not None: # Usual use case
             stylestr = str(style).lower()
             if stylestr in ['default', 'covasim', 'house']:
-                rc = sc.dcp(rc_covasim)
+                rc = rc_covasim.copy()
             elif stylestr in ['simple', 'covasim_simple', 'plain', 'clean']:
-                rc = sc.dcp(rc_simple)
+                rc = rc_simple.copy()
             elif style in pl.style.library:
-                rc = sc.dcp(pl.style.library[style])
+                rc = dict(pl.style.library[style])
             else:
                 errormsg = f'Style "{style}"; not found; options are "covasim" (default), "simple", plus:\n{sc.newlinejoin(pl.style.available)}'
                 raise ValueError(errormsg)
         if reset:
             self.rc = rc
         if copy:
-            rc = sc.dcp(rc)
+            rc = dict(rc)
         return rc
 
 
@@ -489,12 +508,12 @@ class Options(sc.objdict):
                 pl.plot([1,3,6])
         '''
         # Handle inputs
-        rc = sc.dcp(self.rc) # Make a local copy of the currently used settings
+        self._load_fonts() # Only does anything the first time a style is used
         kwargs = sc.mergedicts(style_args, kwargs)
 
         # Handle style, overwiting existing
         style = kwargs.pop('style', None)
-        rc = self._handle_style(style, reset=False)
+        rc = self._handle_style(style, reset=False) # Returns a local copy of the currently used settings
 
         def pop_keywords(sourcekeys, rckey):
             ''' Helper function to handle input arguments '''
@@ -529,9 +548,9 @@ class Options(sc.objdict):
 
         # Tidy up
         if use:
-            return pl.style.use(sc.dcp(rc))
+            return pl.style.use(rc)
         else:
-            return pl.style.context(sc.dcp(rc))
+            return pl.style.context(rc)
 
 
     def use_style(self, **kwargs):
@@ -553,8 +572,12 @@ class Options(sc.objdict):
 
 def reload_numba():
     '''
-    Apply changes to Numba functions -- reloading modules is necessary for
-    changes to propagate. Not necessary to call directly if cv.options.set() is used.
+    Apply changes to Numba functions -- rebuilding them is necessary for changes
+    to propagate. Not necessary to call directly if cv.options.set() is used.
+
+    Only the data types in ``cv.defaults`` and the jitted functions in ``cv.utils``
+    are rebuilt, rather than reloading all of Covasim. Numba caches compiled functions
+    by signature, so caches for other precisions are left untouched on disk.
 
     **Example**::
 
@@ -564,12 +587,15 @@ def reload_numba():
         sim.run()
         assert sim.people.rel_trans.dtype == np.float64
     '''
-    print('Reloading Covasim so changes take effect...')
+    print('Reloading Numba functions so changes take effect...')
     import importlib
     import covasim as cv
-    importlib.reload(cv.defaults)
-    importlib.reload(cv.utils)
-    importlib.reload(cv)
+    cv.defaults.set_precision(options.precision)
+    cv.defaults.nbcache = options.numba_cache
+    importlib.reload(cv.utils) # The Numba signatures and flags are set on import, so the module needs to be reloaded
+    for module in [cv.defaults, cv.utils]: # Update the names copied into the top-level namespace by "import *"
+        for name in module.__all__:
+            setattr(cv, name, getattr(module, name))
     print("Reload complete. Note: for some options to take effect, you may also need to delete Covasim's __pycache__ folder.")
     return
 
@@ -604,6 +630,5 @@ def load_fonts(folder=None, rebuild=False, verbose=False, **kwargs):
     return
 
 
-# Create the options on module load, and load the fonts
-load_fonts()
+# Create the options on module load; fonts are loaded the first time they're needed
 options = Options()
@@ -18,7 +18,7 @@ from . import defaults as cvd # To set default types
 # What functions are externally visible -- note, this gets populated in each section below
 __all__ = []
 
-# Set dtypes -- note, these cannot be changed after import since Numba functions are precompiled
+# Set dtypes -- note, these cannot be changed after import (except via cv.options.set()) since every Numba function is given an explicit signature, and so is compiled on import
 nbbool  = nb.bool_
 nbint   = cvd.nbint
 nbfloat = cvd.nbfloat
@@ -31,7 +31,7 @@ rand_parallel = cvo.numba_parallel in full_opts
 if cvo.numba_parallel not in [0, 1, 2, '0', '1', '2', 'none', 'safe', 'full']:
     errormsg = f'Numba parallel must be "none", "safe", or "full", not "{cvo.numba_parallel}"'
     raise ValueError(errormsg)
-cache = cvo.numba_cache # Turning this off can help switching parallelization options
+cache = cvd.nbcache # Turning this off can help switching parallelization options
 
 
 #%% The core Covasim functions -- compute the infections
@@ -268,6 +268,12 @@ def get_pdf(dist=None, par1=None, par2=None):
     return pdf
 
 
+@nb.njit((nbint,), cache=cache)
+def set_seed_numba(seed): # pragma: no cover
+    ''' Reset Numba's random number stream, which is separate from Numpy's '''
+    return np.random.seed(seed)
+
+
 def set_seed(seed=None):
     '''
     Reset the random seed -- complicated because of Numba, which requires special
@@ -278,10 +284,6 @@ def set_seed(seed=None):
         seed (int): the random seed
     '''
 
-    @nb.njit((nbint,), cache=cache)
-    def set_seed_numba(seed):
-        return np.random.seed(seed)
-
     def set_seed_regular(seed):
         return np.random.seed(seed)
 
@@ -0,0 +1,144 @@
+'''
+Precompile Covasim's Numba functions, so they are loaded from the on-disk cache
+rather than compiled the first time Covasim is used (e.g. after a fresh install
+or deployment). From the command line, use::
+
+    covasim-warmup
+
+or from Python::
+
+    import covasim.warmup
+    covasim.warmup.warmup()
+
+Note: this module is also run directly by ``bin/covasim-warmup`` without importing
+Covasim (which would compile the Numba functions in that process as well), so
+it must not import anything from Covasim at the top level.
+'''
+
+import os
+import sys
+import tempfile
+import warnings
+import subprocess
+import numba as nb
+import sciris as sc
+
+__all__ = ['warmup']
+
+thisdir = os.path.dirname(os.path.abspath(__file__))
+markername = 'covasim_warmup.txt' # Written once the warmup has completed, so it's only run once
+
+
+def _writable(folder):
+    ''' Check whether a folder can be written to, in the same way Numba does when choosing where to cache '''
+    try:
+        os.makedirs(folder, exist_ok=True)
+        tempfile.TemporaryFile(dir=folder).close()
+        return True
+    except OSError:
+        return False
+
+
+def _markerpath():
+    '''
+    Get the path of the marker file, which is stored alongside Numba's cache so
+    that it's removed with it: in NUMBA_CACHE_DIR if set, else Covasim's __pycache__
+    folder if writable, else Numba's user-wide cache folder.
+    '''
+    folder = os.getenv('NUMBA_CACHE_DIR')
+    if not folder:
+        folder = os.path.join(thisdir, '__pycache__')
+        if not _writable(folder):
+            from numba.misc.appdirs import AppDirs # Same as numba.core.caching._UserWideCacheLocator
+            folder = AppDirs(appname='numba', appauthor=False).user_cache_dir
+    return os.path.join(folder, markername)
+
+
+def _marker(precisions):
+    '''
+    Identify the compiled functions: the version of the source (as Numba itself
+    checks for its cache), the Numba and Python versions, and the precisions
+    '''
+    st = os.stat(os.path.join(thisdir, 'utils.py'))
+    pyversion = '.'.join(str(v) for v in sys.version_info[:3])
+    return f'{thisdir} {st.st_mtime}-{st.st_size}; Numba {nb.__version__}; Python {pyversion}: {sorted(precisions)}'
+
+
+def _compile(precision):
+    '''
+    Import Covasim in a fresh interpreter with the given precision -- not for the user.
+    A fresh interpreter is needed since the Numba signatures are set on import.
+    Returns the exit code.
+    '''
+    env = dict(os.environ, COVASIM_PRECISION=str(precision), COVASIM_NUMBA_CACHE='1', COVASIM_VERBOSE='0', COVASIM_WARMUP='0')
+    cmd = [sys.executable, '-c', 'import covasim.utils']
+    return subprocess.run(cmd, env=env).returncode
+
+
+def warmup(precisions=None, verbose=True):
+    '''
+    Populate the Numba cache for all of Covasim's jitted functions. Since these
+    functions have explicit signatures, they are compiled (and cached) as soon
+    as ``cv.utils`` is imported, so no representative inputs are required.
+
+    Each precision is compiled in its own process, one at a time: Numba does not
+    lock its cache index, so compiling the same functions simultaneously can
+    lose entries.
+
+    Args:
+        precisions (list): the arithmetic precisions to compile for (default: 32 and 64 bit)
+        verbose (bool): whether to print progress
+
+    **Example**::
+
+        import covasim.warmup
+        covasim.warmup.warmup(precisions=[32])
+    '''
+    if precisions is None:
+        precisions = [32, 64]
+    precisions = sc.tolist(precisions)
+
+    T = sc.timer()
+    for precision in precisions:
+        if verbose: print(f'Compiling Covasim Numba functions ({precision} bit)...')
+        if _compile(precision):
+            errormsg = f'Compiling Covasim Numba functions ({precision} bit) failed; see above for details'
+            raise RuntimeError(errormsg)
+
+    # Record that the warmup has been done
+    markerpath = _markerpath()
+    try:
+        os.makedirs(os.path.dirname(markerpath), exist_ok=True)
+        with open(markerpath, 'w') as f:
+            f.write(_marker(precisions))
+    except OSError as E: # pragma: no cover
+        warnmsg = f'Could not record that the warmup is complete ({str(E)}), so it will be run again if requested on import'
+        warnings.warn(warnmsg, category=RuntimeWarning, stacklevel=2)
+
+    if verbose: T.toc('Numba cache populated')
+    return
+
+
+def check_warmup():
+    '''
+    Run warmup() on import if the "warmup" option is set (e.g. via the COVASIM_WARMUP
+    environment variable) and it hasn't already been run for this version of the
+    source, Numba, and Python -- not for the user. If there is nowhere to record
+    that the warmup is complete, skip it rather than running it on every import.
+    '''
+    from .settings import options as cvo # Here since this module can be run without Covasim
+    from . import misc as cvm
+    if cvo.warmup:
+        markerpath = _markerpath()
+        try:
+            with open(markerpath) as f:
+                done = f.read() == _marker([32, 64])
+        except OSError:
+            done = False
+        if not done:
+            if _writable(os.path.dirname(markerpath)):
+                warmup(verbose=bool(cvo.verbose))
+            else: # pragma: no cover
+                warnmsg = f'Skipping Numba warmup since {os.path.dirname(markerpath)} is not writable; run covasim-warmup instead'
+                cvm.warn(warnmsg)
+    return
@@ -1,9 +1,11 @@
+import io
+import threading
+import pylab as pl
 import streamlit as st
 import covasim as cv
 
 # Run options
 do_plot = 1
-do_show = 1
 verbose = 1
 
 # Sim options
@@ -21,6 +23,13 @@ metapars = dict(
     quantiles = {'low':0.1, 'high':0.9},
 )
 
+# Precomputed results for the Min/Mid/Max presets, keyed on the raw (accuracy, adherence) slider values
+presets = {
+    (77, 1):  ('Min', 1842.0, -14.03),
+    (77, 10): ('Mid', 1674.0, -23.5),
+    (77, 20): ('Max', 1481.0, -35.49),
+}
+
 
 # Define the actual scenarios
 acc = st.slider("Accuracy of Detecting Covid-19", value=77)
@@ -39,9 +48,14 @@ if maxi:
     acc = 77
     adherence = 20
 additionalMeasures = 0#st.slider("% of people who social distance after an alert", value=10)
-if acc  != 0 and adherence != 0:
-    adherence = adherence / 100
-    acc = acc / 100
+
+
+@st.cache_data(show_spinner=False, max_entries=16) # Bounded, since each entry holds a full set of results
+def _run_scenarios(acc, adherence, additionalMeasures):
+    '''
+    Build and run the scenarios -- cached on the scalar inputs, since every widget
+    interaction reruns this script but only changes to these values change the results
+    '''
     total = acc * adherence
     # So it is people who do social distance 
     invereseAdditionalMeasures = 100 - additionalMeasures
@@ -82,28 +96,43 @@ if acc  != 0 and adherence != 0:
                 },
                 }
 
-    
-
     scens = cv.Scenarios(basepars=basepars, metapars=metapars, scenarios=scenarios)
     scens.run(verbose=verbose)
+    return scens
+
+
+@st.cache_resource
+def _plot_lock():
+    ''' Lock shared by all sessions, since Matplotlib is not thread-safe '''
+    return threading.Lock()
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _plot_scenarios(acc, adherence, additionalMeasures):
+    '''
+    Plot the scenarios and return the rendered PNG -- cached on the same inputs
+    as the results, so the figure is only redrawn when they change. Bytes are
+    cached rather than the figure so that sessions don't share a Matplotlib object.
+    '''
+    scens = _run_scenarios(acc, adherence, additionalMeasures)
+    with _plot_lock():
+        fig = scens.plot(do_show=False)
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', dpi=200, bbox_inches='tight') # Same as st.pyplot()
+        pl.close(fig)
+    return buf.getvalue()
+
+
+if acc  != 0 and adherence != 0:
+    preset = presets.get((acc, adherence))
+    adherence = adherence / 100
+    acc = acc / 100
     if do_plot:
-        fig1 = scens.plot(do_show=do_show)
+        png = _plot_scenarios(acc, adherence, additionalMeasures)
         # st.text(scens)
-        st.pyplot(fig1)
+        st.image(png)
         # sumer = scens.summarize()
-        # 1
-        if total == 0.0077:
-            st.header("Min")
-            st.metric("Percent Difference", value=1842.0, delta= -14.03, delta_color="inverse")
-            
-        # 20
-        if total == 0.15400000000000003:
-            st.header("Max")
-            st.metric("Percent Difference", value=1481.0, delta= -35.49, delta_color="inverse")
-            
-        if total == 0.07700000000000001:
-        # 10
-            st.header("Mid")
-            st.metric("Percent Difference", value=1674.0, delta= -23.5, delta_color="inverse")
-            
-   
+        if preset is not None:
+            name, value, delta = preset
+            st.header(name)
+            st.metric("Percent Difference", value=value, delta=delta, delta_color="inverse")
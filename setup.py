@@ -50,6 +50,7 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=requirements,
+    scripts=['bin/covasim-warmup'], # Precompile the Numba functions; a script rather than an entry point so Covasim isn't imported
     extras_require={
         'full':  [
             'plotly',
@@ -7,6 +7,7 @@ corner cases or otherwise not part of major workflows.
 import os
 import pytest
 import numpy as np
+import numba as nb
 import sciris as sc
 import covasim as cv
 
@@ -435,7 +436,32 @@ def test_sim():
 def test_settings():
     sc.heading('Testing settings')
     cv.options.help()
+    for i in range(2): # Check the cached help output is reused correctly
+        optdict = cv.options.help(detailed=True, output=True)
+        assert optdict.dpi.current == optdict.dpi.default
+    with cv.options.with_style(): # Loads the custom fonts if not already loaded, which should regenerate the help
+        pass
+    optdict = cv.options.help(detailed=True, output=True)
+    assert cv.settings.rc_covasim['font.family'] in optdict.rc.default
     cv.options.set(numba_parallel=False) # Don't actually change the default, but call this method
+    with pytest.raises(sc.KeyNotFoundError):
+        cv.options.set(not_an_option=True)
+    return
+
+
+def test_precision():
+    sc.heading('Testing changing precision')
+    cv.options.set(precision=64)
+    try:
+        assert cv.default_float is np.float64
+        for sig in cv.utils.compute_viral_load.signatures:
+            assert all(getattr(arg, 'dtype', arg) in [nb.float64, nb.int64] for arg in sig), f'Expected a 64-bit signature, not {sig}'
+        sim = cv.Sim(pop_size=100, n_days=5, verbose=0)
+        sim.run()
+        assert sim.people.rel_trans.dtype == np.float64
+    finally:
+        cv.options.set(precision=32) # Restore the default
+    assert cv.default_float is np.float32
     return
 
 
@@ -455,6 +481,7 @@ if __name__ == '__main__':
     test_run()
     test_sim()
     test_settings()
+    test_precision()
 
     print('\n'*2)
     sc.toc(T)
@@ -3,7 +3,10 @@ Tests of the numerical utilities for the model.
 '''
 
 #%% Imports and settings
+import os
 import pytest
+import pathlib
+import tempfile
 import numpy as np
 import numba as nb
 import pylab as pl
@@ -210,6 +213,39 @@ def test_indexing():
     return
 
 
+def test_numba_signatures():
+    sc.heading('Numba signatures')
+
+    # Every jitted function should have an explicit signature, so it is compiled on import rather than on first call
+    dispatchers = {k:v for k,v in vars(cv.utils).items() if hasattr(v, 'py_func') and hasattr(v, 'signatures')}
+    assert len(dispatchers)
+    for name,func in dispatchers.items():
+        assert len(func.signatures), f'Numba function "{name}" was not compiled on import'
+
+    return dispatchers
+
+
+def test_warmup():
+    sc.heading('Numba warmup')
+
+    # Compile in a separate process with an empty cache folder, so that anything in it (including the marker) came from the warmup
+    orig_cachedir = os.environ.get('NUMBA_CACHE_DIR')
+    with tempfile.TemporaryDirectory() as cachedir:
+        os.environ['NUMBA_CACHE_DIR'] = cachedir
+        try:
+            cv.warmup.warmup(precisions=[64], verbose=False) # Raises an exception if the subprocess fails
+        finally:
+            if orig_cachedir is None:
+                del os.environ['NUMBA_CACHE_DIR']
+            else:
+                os.environ['NUMBA_CACHE_DIR'] = orig_cachedir
+        indexfiles = list(pathlib.Path(cachedir).rglob('utils.*.nbi'))
+        assert len(indexfiles), f'No Numba cache index files found in {cachedir}'
+        assert os.path.exists(os.path.join(cachedir, cv.warmup.markername)), 'Warmup was not recorded as complete'
+
+    return len(indexfiles)
+
+
 def test_doubling_time():
 
     sim = cv.Sim(pop_size=1000)
@@ -243,6 +279,8 @@ if __name__ == '__main__':
     people1 = test_choose()
     people2 = test_choose_w()
     inds    = test_indexing()
+    nbfuncs = test_numba_signatures()
+    cache   = test_warmup()
     dt      = test_doubling_time()
 
     print('\n'*2)